@@ -1,90 +1,202 @@
 import os
-import curses
+import sys
+import io
 import json
 import hashlib
+import functools
+import itertools
+import select
+import shutil
+import stat
+import threading
+import re
+import fnmatch
 from pathlib import Path
-from ItsPrompt.prompt import Prompt
-from openai import OpenAI
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-import argparse
-import pathspec
-import pyperclip
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 load_dotenv()
 
-IGNORE_LIST = [".git", "venv", ".summary_files"]
+IGNORE_LIST = (".git", "venv", ".summary_files", "__pycache__", "node_modules", "*.pyc")
+
+# Locations of everything written by this script, built once at import
+SUMMARY_DIRECTORY = Path(".summary_files")
+CODE_SUMMARY_FILE = SUMMARY_DIRECTORY / "code_summary.md"
+COMPRESSED_SUMMARY_FILE = SUMMARY_DIRECTORY / "compressed_code_summary.md"
+PREVIOUS_SELECTION_FILE = SUMMARY_DIRECTORY / "previous_selection.json"
+
+# Summaries larger than this are not copied to the clipboard, which slows down badly
+# with multi-megabyte contents
+CLIPBOARD_MAX_BYTES = 2 * 1024 * 1024
+
+# Fixed text drawn by the file selector on every repaint
+SELECTOR_INSTRUCTIONS = (
+    "Use UP/DOWN arrows to navigate, SPACE to select/deselect, ENTER to confirm.",
+    "Use LEFT/RIGHT arrows to change pages.",
+)
+SELECTOR_STATUS = "Page {}/{} | Items {}-{} of {}"
+
+# Seconds to wait for an answer to a y/N prompt before using the default
+PROMPT_TIMEOUT = 30
+
+# Maximum number of summary requests sent to the API at the same time
+SUMMARY_CONCURRENCY = 8
+
+# Write buffer size for the code summary, and how many selected files are read ahead of it
+COPY_BLOCK_SIZE = 1 << 20
+READ_AHEAD = 8
+
+# Stored alongside each cached summary so a change of algorithm invalidates old entries
+HASH_ALGO = "blake2b-128"
+
+# O_NOATIME (Linux, file owner only) keeps hashing from writing back access times
+HASH_OPEN_FLAGS = os.O_RDONLY | getattr(os, "O_BINARY", 0) | getattr(os, "O_NOATIME", 0)
 
 LLM_MODEL=os.getenv("LLM_MODEL", "gpt-4o")
-print(f"Using model: {LLM_MODEL}")
 
-def build_tree(directory, gitignore_specs, ignore_list):
-    tree = {}
-    for root, dirs, files in os.walk(directory):
-        # Skip ignored directories
-        dirs[:] = [d for d in dirs if d not in ignore_list and (gitignore_specs is None or not gitignore_specs.match_file(d))]
-        
-        current = tree
-        path = root.split(os.sep)[1:]  # Skip the '.' at the beginning
-        for part in path:
-            current = current.setdefault(part, {})
-        
-        for file in files:
-            if gitignore_specs is None or not gitignore_specs.match_file(os.path.join(root, file)):
-                current[file] = os.path.join(root, file)
-    
+_SCAN_CACHE = {}
+
+# One stat call that doubles as the existence check, so callers can reuse the result
+def _stat_or_none(path):
+    try:
+        return os.stat(path)
+    except FileNotFoundError:
+        return None
+
+def _gitignore_mtime():
+    gitignore_stat = _stat_or_none(".gitignore")
+    return gitignore_stat.st_mtime_ns if gitignore_stat is not None else None
+
+# Plain names are pruned with a set lookup, wildcard patterns are folded into one
+# compiled regex, and entries containing a slash are compared against the path
+# relative to the project root
+@functools.lru_cache(maxsize=8)
+def _split_ignore_list(ignore_list):
+    ignore_globs = [item for item in ignore_list if any(char in item for char in "*?[")]
+    ignore_glob_re = re.compile("|".join(fnmatch.translate(item) for item in ignore_globs)) if ignore_globs else None
+    ignore_names = frozenset(item for item in ignore_list if "/" not in item and item not in ignore_globs)
+    ignore_paths = frozenset(item.strip("/") for item in ignore_list if "/" in item and item not in ignore_globs)
+    return ignore_names, ignore_paths, ignore_glob_re
+
+# Walks the directory once with os.scandir and returns both the flat list of entries
+# used by the file selector and the rendered tree text written at the top of the summaries
+def _scan_once(directory, gitignore_match, ignore_list):
+    ignore_list = tuple(ignore_list)
+    cache_key = (os.path.abspath(directory), _gitignore_mtime(), ignore_list)
+    if cache_key in _SCAN_CACHE:
+        return _SCAN_CACHE[cache_key]
+
+    ignore_names, ignore_paths, ignore_glob_re = _split_ignore_list(ignore_list)
+
+    def scan(path):
+        with os.scandir(path) as it:
+            return iter(sorted(it, key=lambda entry: entry.name))
+
+    # Depth-first walk with an explicit stack of directory iterators. Entries are
+    # recorded in visiting order, which is already the order the selector lists them
+    # in: each directory as "dir/" with no file path, followed by its contents
+    tree = []
+    buffer = io.StringIO()
+    stack = [(scan(directory), "", 0)]
+    while stack:
+        entries, rel_prefix, level = stack[-1]
+        entry = next(entries, None)
+        if entry is None:
+            stack.pop()
+            continue
+
+        if entry.name in ignore_names or (ignore_glob_re is not None and ignore_glob_re.match(entry.name)):
+            continue
+
+        # DirEntry reuses the type from the directory listing, so no extra stat here.
+        # Relative paths are built by concatenating onto the parent's "dir/" prefix
+        rel_path = rel_prefix + entry.name
+        if rel_path in ignore_paths:
+            continue
+        if entry.is_dir(follow_symlinks=False):
+            if gitignore_match is not None and gitignore_match(rel_path + "/"):
+                continue
+            buffer.write(f"{' ' * (4 * level)}|-- {entry.name}\n")
+            tree.append((rel_path + "/", None))
+            stack.append((scan(entry.path), rel_path + "/", level + 1))
+        elif entry.is_file():
+            if gitignore_match is not None and gitignore_match(rel_path):
+                continue
+            buffer.write(f"{' ' * (4 * level)}|-- {entry.name}\n")
+            tree.append((rel_path, entry.path))
+
+    tree_output = buffer.getvalue()
+    _SCAN_CACHE[cache_key] = (tree, tree_output)
+    return tree, tree_output
+
+# Returns (relative path, file path) pairs in display order, with directories as
+# ("dir/", None)
+def build_tree(directory, gitignore_match, ignore_list):
+    tree, _ = _scan_once(directory, gitignore_match, ignore_list)
     return tree
 
-def flatten_tree(tree, prefix=''):
-    items = []
-    for key, value in sorted(tree.items()):
-        if isinstance(value, dict):
-            items.append((f"{prefix}{key}/", None))
-            items.extend(flatten_tree(value, prefix=f"{prefix}{key}/"))
-        else:
-            items.append((f"{prefix}{key}", value))
-    return items
-
 
 def parse_arguments():
+    import argparse
     parser = argparse.ArgumentParser(description="Generate code summaries and README.")
     parser.add_argument("--infer", action="store_true", help="Enable OpenAI calls for summaries and readme")
+    parser.add_argument("--non-interactive", action="store_true",
+                        help="Reuse the previous selection and skip the clipboard and follow-up prompts")
+    parser.add_argument("--stdout", action="store_true", help="Write the code summary to stdout and status messages to stderr; reuses the previous selection")
+    parser.add_argument("--clipboard-max-bytes", type=int, default=CLIPBOARD_MAX_BYTES,
+                        help="Largest summary copied to the clipboard; bigger summaries copy their file path instead")
+    parser.add_argument("--reuse-selection", action="store_true", help="Skip the file selector and reuse the previous selection")
     return parser.parse_args()
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# Asks a y/N question, returning the default if stdin is closed or, on POSIX, if no
+# answer arrives within the timeout so unattended runs don't hang
+def prompt_with_timeout(message, default="n", timeout=PROMPT_TIMEOUT):
+    print(message, end="", flush=True)
+    if os.name == "posix":
+        ready, _, _ = select.select([sys.stdin], [], [], timeout)
+        answer = sys.stdin.readline() if ready else ""
+    else:
+        try:
+            answer = input()
+        except EOFError:
+            answer = ""
+
+    answer = answer.strip().lower()
+    if not answer:
+        print(default)
+        return default
+    return answer
+
+# openai pulls in a large dependency tree, so it is only imported once an API call is made
+@functools.lru_cache(maxsize=None)
+def get_client():
+    from openai import OpenAI
+    return OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+# Imports openai and builds the shared client on a background thread, so that cost
+# overlaps with the user reading the prompts instead of following their answer
+def warm_up_client():
+    threading.Thread(target=get_client, daemon=True).start()
 
 # Creates a hidden directory to store the summary files
 def create_hidden_directory():
-    hidden_directory = Path(".summary_files")
-    if not hidden_directory.exists():
-        hidden_directory.mkdir()
+    SUMMARY_DIRECTORY.mkdir(exist_ok=True)
 
 def get_tree_output():
-    def walk_directory_tree(directory, level, gitignore_specs):
-        output = ""
-        for entry in sorted(os.listdir(directory)):
-            entry_path = os.path.join(directory, entry)
-            relative_entry_path = os.path.relpath(entry_path, ".")
-
-            # Check if the entry is not in the IGNORE_LIST
-            if not any(ignore_item in entry_path for ignore_item in IGNORE_LIST):
-                if gitignore_specs is None or not gitignore_specs.match_file(relative_entry_path):
-                    if os.path.isfile(entry_path):
-                        output += f"{' ' * (4 * level)}|-- {entry}\n"
-                    elif os.path.isdir(entry_path):
-                        output += f"{' ' * (4 * level)}|-- {entry}\n"
-                        output += walk_directory_tree(entry_path, level + 1, gitignore_specs)
-        return output
-
-    gitignore_specs = parse_gitignore()
-    tree_output = walk_directory_tree(".", 0, gitignore_specs)
+    gitignore_match = parse_gitignore()
+    _, tree_output = _scan_once(".", gitignore_match, IGNORE_LIST)
     return tree_output
 
-def generate_summary(file_content):
-    print("Waiting for summary. This may take a few minutes...")
-
+async def generate_summary(async_client, file_content):
     # Make the call to the OpenAI API to generate the summary
-    completion = client.chat.completions.create(
+    completion = await async_client.chat.completions.create(
         model=LLM_MODEL,
         messages=[
             {"role": "system", "content": "You are a code documenter. Your purpose is to provide useful summaries for "
@@ -100,11 +212,29 @@ def generate_summary(file_content):
     summary = completion.choices[0].message.content
     return summary
 
+# Runs up to SUMMARY_CONCURRENCY summary requests at once and returns them in input
+# order. A failed request leaves its exception in place of the summary so the others
+# are still returned
+async def generate_summaries(file_contents):
+    import asyncio
+    print(f"Waiting for {len(file_contents)} summaries. This may take a few minutes...")
+    semaphore = asyncio.Semaphore(SUMMARY_CONCURRENCY)
+
+    from openai import AsyncOpenAI
+
+    async with AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY")) as async_client:
+        async def summarize(file_content):
+            async with semaphore:
+                return await generate_summary(async_client, file_content)
+
+        return await asyncio.gather(*(summarize(file_content) for file_content in file_contents),
+                                    return_exceptions=True)
+
 def generate_readme(compressed_summary):
     print("Generating updated READMfE.md file...")
 
     # Make the call to the OpenAI API to generate the README content
-    completion = client.chat.completions.create(
+    completion = get_client().chat.completions.create(
         model="gpt-4-1106-preview",
         messages=[
             {"role": "system", "content": "You are a code documenter. Your task is to create an updated README.md file for a project "
@@ -121,26 +251,159 @@ def generate_readme(compressed_summary):
     return readme_content
 
 
-def create_compressed_summary(selected_files):
-    summary_directory = Path(".summary_files")
-    compressed_summary_file = summary_directory / "compressed_code_summary.md"
-    if compressed_summary_file.exists():
-        compressed_summary_file.unlink()
+# Cache files are read and written through orjson when it is installed
+def read_json(path):
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    with open(path, "r") as f:
+        return json.load(f)
+
+def write_json(path, data):
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(data))
+    else:
+        with open(path, "w") as f:
+            json.dump(data, f)
+
+
+# Hashes the raw bytes with unbuffered reads into a single buffer of at most 1 MiB
+def hash_file(file_path):
+    file_hash = hashlib.blake2b(digest_size=16)
+    try:
+        fd = os.open(file_path, HASH_OPEN_FLAGS)
+    except PermissionError:
+        fd = os.open(file_path, HASH_OPEN_FLAGS & ~getattr(os, "O_NOATIME", 0))
+    with open(fd, "rb", buffering=0) as f:
+        # Sized to the file so small files don't pay for zeroing a 1 MiB buffer
+        buffer = bytearray(min(os.fstat(fd).st_size + 1, 1 << 20))
+        view = memoryview(buffer)
+        while read_size := f.readinto(buffer):
+            file_hash.update(view[:read_size])
+    return file_hash.hexdigest()
+
+
+# Collects every directory and metadata file under the summary directory in one pass
+def scan_summary_directory(summary_directory):
+    existing_directories = {summary_directory}
+    existing_metadata = {}
+    pending = [summary_directory]
+    while pending:
+        with os.scandir(pending.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    existing_directories.add(entry.path)
+                    pending.append(entry.path)
+                elif entry.name.endswith("_metadata.json"):
+                    existing_metadata[entry.path] = entry
+    return existing_directories, existing_metadata
+
 
-    with open(compressed_summary_file, "a") as summary:
+def create_compressed_summary(selected_files):
+    # One scan of the cache directory replaces an exists() check and a mkdir() per file
+    metadata_root = os.fspath(SUMMARY_DIRECTORY)
+    existing_directories, existing_metadata = scan_summary_directory(metadata_root)
+
+    # Metadata paths are built as plain strings to keep this per-file loop out of pathlib
+    # Selected paths come from scanning ".", so stripping that prefix replaces normpath
+    current_prefix = os.curdir + os.sep
+    metadata_paths = {}
+    for file in selected_files:
+        if file == "main.py":
+            continue
+        relative_file = file[len(current_prefix):] if file.startswith(current_prefix) else os.path.normpath(file)
+        relative_parent, file_name = os.path.split(relative_file)
+        metadata_directory = os.path.join(metadata_root, relative_parent) if relative_parent else metadata_root
+        metadata_paths[file] = os.path.join(metadata_directory, f"{file_name}_metadata.json")
+
+    for metadata_directory in {os.path.dirname(path) for path in metadata_paths.values()} - existing_directories:
+        os.makedirs(metadata_directory, exist_ok=True)
+
+    # Hashes a file and loads its saved metadata. Pure file I/O, so these run in a
+    # thread pool while the summaries themselves are written in order below
+    def prepare(file):
+        metadata_path = metadata_paths[file]
+        file_stat = os.stat(file)
+        metadata = None
+        if metadata_path in existing_metadata:
+            metadata = read_json(metadata_path)
+
+        # If size and mtime match what was recorded, the saved hash still describes the
+        # file and reading it again can be skipped
+        if (metadata is not None and metadata.get("hash_algo") == HASH_ALGO
+                and metadata.get("mtime_ns") == file_stat.st_mtime_ns and metadata.get("size") == file_stat.st_size):
+            current_hash = metadata["hash"]
+        else:
+            current_hash = hash_file(file)
+        return metadata_path, file_stat, current_hash, metadata
+
+    # Sort files into cached summaries and ones that need a new summary, which are
+    # then requested from the API concurrently
+    file_summaries = {}
+    pending = []
+    status = []
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+        for file, prepared in zip(metadata_paths, executor.map(prepare, metadata_paths)):
+            metadata_path, file_stat, current_hash, metadata = prepared
+            new_metadata = {
+                "hash": current_hash,
+                "hash_algo": HASH_ALGO,
+                "mtime_ns": file_stat.st_mtime_ns,
+                "size": file_stat.st_size,
+            }
+
+            if metadata is not None:
+                status.append(f"File {file} has been summarized before. Checking if it has been modified...")
+                if metadata.get("hash_algo") == HASH_ALGO and metadata["hash"] == current_hash:
+                    status.append(f"File {file} has not been modified. Using saved summary...")
+                    file_summaries[file] = metadata["summary"]
+                    # Content is the same but the file was touched, record the new stat
+                    if metadata.get("mtime_ns") != file_stat.st_mtime_ns or metadata.get("size") != file_stat.st_size:
+                        new_metadata["summary"] = metadata["summary"]
+                        write_json(metadata_path, new_metadata)
+                    continue
+                status.append(f"File {file} has been modified. Generating new summary...")
+            else:
+                status.append(f"File {file} has not been summarized before. Generating summary...")
+            pending.append((file, metadata_path, new_metadata))
+
+    if status:
+        sys.stdout.write("\n".join(status) + "\n")
+        sys.stdout.flush()
+
+    if pending:
+        # Only decode the files that actually have to be sent for summarizing
+        file_contents = []
+        for file, _, _ in pending:
+            with open(file, "r") as f:
+                file_contents.append(f.read())
+
+        import asyncio
+        summaries = asyncio.run(generate_summaries(file_contents))
+
+        # Cache every summary that came back before reporting a failed request, so a
+        # rerun only has to redo the failures
+        failure = None
+        for (file, metadata_path, new_metadata), file_summary in zip(pending, summaries):
+            if isinstance(file_summary, BaseException):
+                failure = failure or file_summary
+                continue
+            new_metadata["summary"] = file_summary
+            write_json(metadata_path, new_metadata)
+            file_summaries[file] = file_summary
+        if failure is not None:
+            raise failure
+
+    with open(COMPRESSED_SUMMARY_FILE, "w") as summary:
         # Include the output of the tree command at the beginning
         tree_output = get_tree_output()
         summary.write(f"Output of tree command:\n```\n{tree_output}\n```\n\n---\n")
 
+        # Progress lines are collected and written to stdout in one go
+        progress = []
         for file in selected_files:
 
-            file_path = Path(file)
-            relative_path = file_path.relative_to(".")
-            metadata_directory = summary_directory / relative_path.parent
-            metadata_directory.mkdir(parents=True, exist_ok=True)
-            metadata_path = metadata_directory / f"{file_path.name}_metadata.json"
-
-
             if file == "main.py":
                 summary.write(f"\n{file}\n```\n")
                 with open(file, "r") as f:
@@ -148,73 +411,53 @@ def create_compressed_summary(selected_files):
                     summary.write(file_content)
                 summary.write("```\n---\n")
             else:
-                if metadata_path.exists():
-                    print(f"File {file} has been summarized before. Checking if it has been modified...")
-                    with open(metadata_path, "r") as metadata_file:
-                        metadata = json.load(metadata_file)
-                    saved_hash = metadata["hash"]
-
-                    with open(file, "r") as f:
-                        file_content = f.read()
-                    current_hash = hashlib.md5(file_content.encode("utf-8")).hexdigest()
-
-                    if saved_hash == current_hash:
-                        print(f"File {file} has not been modified. Using saved summary...")
-                        file_summary = metadata["summary"]
-                    else:
-                        print(f"File {file} has been modified. Generating new summary...")
-                        file_summary = generate_summary(file_content)
-                        metadata = {"hash": current_hash, "summary": file_summary}
-                        with open(metadata_path, "w") as metadata_file:
-                            json.dump(metadata, metadata_file)
-                else:
-                    print(f"File {file} has not been summarized before. Generating summary...")
-                    with open(file, "r") as f:
-                        file_content = f.read()
-                    file_summary = generate_summary(file_content)
-                    current_hash = hashlib.md5(file_content.encode("utf-8")).hexdigest()
-                    metadata = {"hash": current_hash, "summary": file_summary}
-                    with open(metadata_path, "w") as metadata_file:
-                        json.dump(metadata, metadata_file)
-
-                print(f"Saving summary for {file}...")
+                progress.append(f"Saving summary for {file}...")
 
                 summary.write(f"\n{file}\n```\n")
-                summary.write(file_summary)
+                summary.write(file_summaries[file])
                 summary.write("```\n---\n")
 
-                print("-----------------------------------")
-
+                progress.append("-----------------------------------")
+
+    if progress:
+        sys.stdout.write("\n".join(progress) + "\n")
+
+
+# Returns a function telling whether a relative path is ignored, or None when there is
+# nothing to match. Compiled matchers are reused until .gitignore changes on disk; the
+# stat fields are part of the cache key so an edited file gets a fresh entry
+@functools.lru_cache(maxsize=32)
+def _compile_gitignore(gitignore_path, mtime_ns, size):
+    import pathspec
+    with open(gitignore_path, "r") as f:
+        gitignore_content = f.read()
+    spec = pathspec.PathSpec.from_lines(pathspec.patterns.GitWildMatchPattern, gitignore_content.splitlines())
+
+    # Without negations a path is ignored as soon as any pattern matches, so all of
+    # them can be tried as one compiled alternation. Named groups are made plain
+    # because every pattern reuses the same group name
+    patterns = [pattern for pattern in spec.patterns if pattern.include is not None]
+    if not patterns:
+        # Blank or comment-only, so the walk can skip matching altogether
+        return None
+    if all(pattern.include for pattern in patterns):
+        named_group_re = re.compile(r"\(\?P<\w+>")
+        combined_re = re.compile("|".join(
+            "(?:" + named_group_re.sub("(?:", pattern.regex.pattern) + ")" for pattern in patterns))
+        return combined_re.search
+    return spec.match_file
 
 def parse_gitignore():
-    gitignore_path = Path(".gitignore")
-    if gitignore_path.exists():
-        with open(gitignore_path, "r") as f:
-            gitignore_content = f.read()
-        gitignore_specs = pathspec.PathSpec.from_lines(pathspec.patterns.GitWildMatchPattern, gitignore_content.splitlines())
-    else:
-        gitignore_specs = None
-    return gitignore_specs
+    gitignore_path = os.path.abspath(".gitignore")
+    gitignore_stat = _stat_or_none(gitignore_path)
+    if gitignore_stat is None:
+        return None
+    return _compile_gitignore(gitignore_path, gitignore_stat.st_mtime_ns, gitignore_stat.st_size)
 
-def display_files():
-    print("List of files in the current directory and its subdirectories:")
-    files = []
-    gitignore_specs = parse_gitignore()
-    for root, _, filenames in os.walk("."):
+def select_files(directory, previous_selection, gitignore_match, ignore_list):
+    import curses
 
-        # Check if the root directory is in the IGNORE_LIST
-        if not any(ignore_item in root for ignore_item in IGNORE_LIST):
-            for filename in filenames:
-                file_path = os.path.join(root, filename)
-                if gitignore_specs is None or not gitignore_specs.match_file(file_path):
-                    files.append(file_path)
-    return files
-
-
-
-def select_files(directory, previous_selection, gitignore_specs, ignore_list):
-    tree = build_tree(directory, gitignore_specs, ignore_list)
-    flattened_tree = flatten_tree(tree)
+    flattened_tree = build_tree(directory, gitignore_match, ignore_list)
     
     options = []
     file_paths = {}
@@ -225,32 +468,31 @@ def select_files(directory, previous_selection, gitignore_specs, ignore_list):
         else:
             options.append((f"[{item}]", item))
 
-    def draw_menu(stdscr, current_page, current_pos):
-        stdscr.clear()
-        h, w = stdscr.getmaxyx()
+    # Row markers and attributes indexed by (is selected) and (is the current position)
+    row_markers = ("[ ] ", "[X] ")
+    row_attrs = (curses.A_NORMAL, curses.A_REVERSE)  # Highlight the current position
+
+    def draw_row(stdscr, start_idx, idx, current_pos):
+        item = options[start_idx + idx][0]
+        stdscr.move(idx + 2, 0)
+        stdscr.clrtoeol()
+        stdscr.addstr(idx + 2, 0, row_markers[item in selected] + item, row_attrs[idx == current_pos])
+
+    def draw_menu(stdscr, current_page, current_pos, page_size):
+        stdscr.erase()
         
-        page_size = h - 4  # Leave room for instructions and status line
         start_idx = current_page * page_size
         end_idx = min(start_idx + page_size, len(options))
-        current_options = options[start_idx:end_idx]
 
-        stdscr.addstr(0, 0, "Use UP/DOWN arrows to navigate, SPACE to select/deselect, ENTER to confirm.")
-        stdscr.addstr(1, 0, "Use LEFT/RIGHT arrows to change pages.")
+        for line, text in enumerate(SELECTOR_INSTRUCTIONS):
+            stdscr.addstr(line, 0, text)
         
-        for idx, (item, _) in enumerate(current_options):
-            if idx == current_pos:
-                attr = curses.A_REVERSE  # Highlight the current position
-            else:
-                attr = curses.A_NORMAL
-            
-            if item in selected:
-                stdscr.addstr(idx + 2, 0, f"[X] {item}", attr)
-            else:
-                stdscr.addstr(idx + 2, 0, f"[ ] {item}", attr)
+        for idx in range(end_idx - start_idx):
+            draw_row(stdscr, start_idx, idx, current_pos)
         
         total_pages = (len(options) + page_size - 1) // page_size
-        status = f"Page {current_page + 1}/{total_pages} | Items {start_idx + 1}-{end_idx} of {len(options)}"
-        stdscr.addstr(h-1, 0, status)
+        status = SELECTOR_STATUS.format(current_page + 1, total_pages, start_idx + 1, end_idx, len(options))
+        stdscr.addstr(page_size + 3, 0, status)
         
         stdscr.refresh()
 
@@ -259,11 +501,24 @@ def select_files(directory, previous_selection, gitignore_specs, ignore_list):
         curses.curs_set(0)  # Hide the cursor
         current_page = 0
         current_pos = 0
-        page_size = curses.LINES - 4  # Leave room for instructions and status line
+        # The layout only changes when the terminal is resized, so work it out once here
+        page_size = max(1, stdscr.getmaxyx()[0] - 4)  # Leave room for instructions and status line
+        # Nothing is drawn while the window is too short for a single row
+        fits = stdscr.getmaxyx()[0] >= page_size + 4
+        redraw = True
 
         while True:
-            draw_menu(stdscr, current_page, current_pos)
+            # The whole page is only repainted when it changes; cursor moves and
+            # toggles just repaint the rows they touch
+            if redraw:
+                if fits:
+                    draw_menu(stdscr, current_page, current_pos, page_size)
+                else:
+                    stdscr.erase()
+                    stdscr.refresh()
+                redraw = False
             key = stdscr.getch()
+            previous_pos = current_pos
 
             if key == ord(' '):  # Spacebar
                 item = options[current_page * page_size + current_pos][0]
@@ -278,101 +533,189 @@ def select_files(directory, previous_selection, gitignore_specs, ignore_list):
             elif key == curses.KEY_LEFT and current_page > 0:
                 current_page -= 1
                 current_pos = 0
+                redraw = True
             elif key == curses.KEY_RIGHT and (current_page + 1) * page_size < len(options):
                 current_page += 1
                 current_pos = 0
+                redraw = True
+            elif key == curses.KEY_RESIZE:
+                current_idx = current_page * page_size + current_pos
+                page_size = max(1, stdscr.getmaxyx()[0] - 4)
+                current_page, current_pos = divmod(current_idx, page_size)
+                fits = stdscr.getmaxyx()[0] >= page_size + 4
+                redraw = True
             elif key == 10:  # Enter key
                 return
+            else:
+                continue
+
+            if fits and not redraw:
+                for idx in {previous_pos, current_pos}:
+                    draw_row(stdscr, current_page * page_size, idx, current_pos)
+                stdscr.refresh()
 
-    selected = set(item for item, _ in options if file_paths.get(item) in previous_selection)
+    previous_paths = set(previous_selection)
+    selected = {item for item, path in file_paths.items() if path in previous_paths}
     curses.wrapper(curses_main)
 
     return [file_paths[item] for item in selected if item in file_paths]
 
 
-def create_code_summary(selected_files):
-    summary_directory = Path(".summary_files")
-    summary_file = summary_directory / "code_summary.md"
-    if summary_file.exists():
-        summary_file.unlink()
-    with open(summary_file, "a") as summary:
+# Streams the code summary to disk and returns its text so callers don't need to read
+# it back, or None if it grew past max_text_bytes, so oversized summaries are never
+# held in memory
+def create_code_summary(selected_files, max_text_bytes=None):
+    written = []
+    written_size = 0
+    with open(CODE_SUMMARY_FILE, "wb", buffering=COPY_BLOCK_SIZE) as summary:
+        def write(data):
+            nonlocal written, written_size
+            summary.write(data)
+            written_size += len(data)
+            if written is None:
+                return
+            if max_text_bytes is not None and written_size > max_text_bytes:
+                written = None
+            else:
+                written.append(data)
+
         # Include the output of the tree command at the beginning
         tree_output = get_tree_output()
-        summary.write(f"Output of tree command:\n```\n{tree_output}\n```\n\n---\n")
-
-        for file_path in selected_files:
-            summary.write(f"\n{file_path}\n```\n")
-            with open(file_path, "r") as f:
-                summary.write(f.read())
-            summary.write("```\n---\n")
-
-
-
+        write(f"Output of tree command:\n```\n{tree_output}\n```\n\n---\n".encode("utf-8"))
+
+        # A few files are read ahead on worker threads so their I/O overlaps with
+        # writing, while output still goes out in selection order
+        with ThreadPoolExecutor(max_workers=READ_AHEAD) as executor:
+            remaining = iter(selected_files)
+            pending = deque((file_path, executor.submit(Path(file_path).read_bytes))
+                            for file_path in itertools.islice(remaining, READ_AHEAD))
+            while pending:
+                file_path, content = pending.popleft()
+                for next_path in itertools.islice(remaining, 1):
+                    pending.append((next_path, executor.submit(Path(next_path).read_bytes)))
+
+                write(f"\n{file_path}\n```\n".encode("utf-8"))
+                write(content.result())
+                write(b"```\n---\n")
+
+    if written is None:
+        return None
+    return b"".join(written).decode("utf-8", errors="replace")
+
+
+# Imports pyperclip and picks its clipboard mechanism, which probes for xclip and
+# similar tools, returning the copy function to use
+def load_clipboard_copy():
+    import pyperclip
+    copy, _ = pyperclip.determine_clipboard()
+    return copy
 
 def read_previous_selection():
-    hidden_directory = Path(".summary_files") 
-    selection_file = hidden_directory / "previous_selection.json" 
-    if selection_file.exists():
-        with open(selection_file, "r") as f: 
-            previous_selection = json.load(f)
-        return previous_selection
+    selection_stat = _stat_or_none(PREVIOUS_SELECTION_FILE)
+    if selection_stat is not None and stat.S_ISREG(selection_stat.st_mode):
+        return read_json(PREVIOUS_SELECTION_FILE)
     else:
         return []
 
 def write_previous_selection(selected_files):
-    hidden_directory = Path(".summary_files")  
-    with open(hidden_directory / "previous_selection.json", "w") as f: 
-        json.dump(selected_files, f)
+    write_json(PREVIOUS_SELECTION_FILE, selected_files)
 
 def main():
+    args = parse_arguments()
+    summary_output = sys.stdout
+    if args.stdout:
+        # Status messages move to stderr so stdout carries only the summary
+        sys.stdout = sys.stderr
+    print(f"Using model: {LLM_MODEL}")
     create_hidden_directory()
     
-    gitignore_specs = parse_gitignore()
+    gitignore_match = parse_gitignore()
+    # IGNORE_LIST is a tuple, so sharing it here cannot change the module default
     ignore_list = IGNORE_LIST
     
     previous_selection = read_previous_selection()
-    selected_files = select_files(".", previous_selection, gitignore_specs, ignore_list)
+    # The selector draws on stdout, so --stdout can only run with a saved selection
+    if (args.reuse_selection or args.non_interactive or args.stdout) and previous_selection:
+        # Skip the selector, keeping the previously selected files that are still in the tree
+        current_paths = {path for _, path in build_tree(".", gitignore_match, ignore_list) if path}
+        selected_files = [path for path in previous_selection if path in current_paths]
+    elif args.non_interactive or args.stdout:
+        sys.exit("No previous selection found. Run once without --non-interactive or --stdout to choose the files.")
+    else:
+        selected_files = select_files(".", previous_selection, gitignore_match, ignore_list)
     
     # Save the selected files
     write_previous_selection(selected_files)
     
-    # Create the local code summary
-    create_code_summary(selected_files)
+    # Create the local code summary while the clipboard is set up on another thread
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        clipboard = executor.submit(load_clipboard_copy) if not args.non_interactive else None
+        summary_content = create_code_summary(selected_files, args.clipboard_max_bytes)
     print("\nLocal code summary successfully created in '.summary_files/code_summary.md'.")
 
+    if args.stdout:
+        # Copied as bytes so the summary is passed through unchanged whatever the
+        # encoding of stdout
+        summary_output.flush()
+        with open(CODE_SUMMARY_FILE, "rb") as f:
+            shutil.copyfileobj(f, summary_output.buffer, COPY_BLOCK_SIZE)
+        summary_output.buffer.flush()
+
+    if args.non_interactive:
+        return
+
     # Copy code_summary.md contents to clipboard
-    summary_file_path = Path(".summary_files") / "code_summary.md"
-    with open(summary_file_path, "r") as summary_file:
-        summary_content = summary_file.read()
-    pyperclip.copy(summary_content)
-    print("Code summary has been copied to clipboard.")
+    copy_to_clipboard = clipboard.result()
+    if summary_content is None:
+        summary_size = os.stat(CODE_SUMMARY_FILE).st_size
+        copy_to_clipboard(f"Code summary is in {CODE_SUMMARY_FILE.resolve()} ({summary_size} bytes)")
+        print(f"Code summary is {summary_size} bytes, over the {args.clipboard_max_bytes} byte clipboard limit. "
+              "Its file path has been copied to clipboard instead.")
+    else:
+        copy_to_clipboard(summary_content)
+        print("Code summary has been copied to clipboard.")
+
+    # Both remaining steps call the API, so don't offer them without a key
+    if not os.getenv("OPENAI_API_KEY"):
+        print("\nOPENAI_API_KEY is not set. Skipping the compressed summary and README steps.")
+        return
+
+    warm_up_client()
 
     # Ask user if they want to generate a compressed summary
-    generate_compressed = input("\nDo you want to generate a compressed summary of the selected files? (y/N): ").lower() == 'y'
+    generate_compressed = prompt_with_timeout("\nDo you want to generate a compressed summary of the selected files? (y/N): ") == 'y'
 
     if generate_compressed:
         create_compressed_summary(selected_files)
         print("\nCompressed code summary successfully created in '.summary_files/compressed_code_summary.md'.")
         
         # Ask user if they want to generate an updated README
-    generate_readme_file = input("\nDo you want to generate an updated README.md file? (y/N): ").lower() == 'y'
+    generate_readme_file = prompt_with_timeout("\nDo you want to generate an updated README.md file? (y/N): ") == 'y'
 
+    compressed_summary = None
     if generate_readme_file:
-        # Load compressed code summary
-        summary_directory = Path(".summary_files")
-        compressed_summary_file = summary_directory / "compressed_code_summary.md"
-        with open(compressed_summary_file, "r") as f:
-            compressed_summary = f.read()
+        # Load compressed code summary, reading it directly rather than checking for it first
+        try:
+            compressed_summary = COMPRESSED_SUMMARY_FILE.read_text()
+        except FileNotFoundError:
+            print("\nNo compressed summary found. Generate one first to create an updated README.md file.")
 
+    if compressed_summary is not None:
         # Generate updated README.md file using GPT-4
         readme_content = generate_readme(compressed_summary)
 
-        # Save the updated README.md file
+        # Save the updated README.md file, leaving it untouched if nothing changed
         readme_file = Path("README.md")
-        with open(readme_file, "w") as f:
-            f.write(readme_content)
+        try:
+            existing_readme = readme_file.read_text()
+        except FileNotFoundError:
+            existing_readme = None
 
-        print("\nUpdated README.md file successfully generated in 'README.md'.")
+        if existing_readme == readme_content:
+            print("\nREADME.md is already up to date.")
+        else:
+            readme_file.write_text(readme_content)
+            print("\nUpdated README.md file successfully generated in 'README.md'.")
 
 if __name__ == "__main__":
     main()
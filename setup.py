@@ -5,7 +5,6 @@ import subprocess
 import sys
 import platform
 from pathlib import Path
-import shutil
 
 def is_windows():
     return platform.system().lower() == "windows"
@@ -66,23 +65,16 @@ def set_alias(run_command):
 
 def check_and_create_env_file(script_dir):
     env_file = script_dir / ".env"
-    env_example = script_dir / "env_example"
 
     if not env_file.exists():
         print("No .env file found. Creating one...")
-        if env_example.exists():
-            shutil.copy(env_example, env_file)
-            print("Created .env file from env_example.")
-        else:
-            print("env_example not found. Creating a new .env file.")
-            env_file.touch()
-
         openai_api_key = input("Please enter your OpenAI API key: ")
         llm_model = input("Enter the LLM model to use (default is gpt-4): ") or "gpt-4"
 
-        with open(env_file, "w") as f:
-            f.write(f"OPENAI_API_KEY={openai_api_key}\n")
-            f.write(f"LLM_MODEL={llm_model}\n")
+        # Written once to a temporary file and renamed into place
+        tmp_env_file = env_file.with_name(".env.tmp")
+        tmp_env_file.write_text(f"OPENAI_API_KEY={openai_api_key}\nLLM_MODEL={llm_model}\n")
+        tmp_env_file.replace(env_file)
 
         print(".env file created successfully.")
     else: